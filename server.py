@@ -1,10 +1,22 @@
 import os
+import re
 import json
+import time
+import asyncio
+import heapq
 import logging
-from typing import List, Dict, Any, Optional, Tuple, Union
-from itertools import chain
-
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote_plus
+from typing import List, Dict, Any, Optional, Tuple, Union, Hashable, Callable, Awaitable, FrozenSet, Set, AsyncIterator
+from itertools import chain, islice
+from operator import methodcaller
+
+import httpx
+import orjson
 import pyalex
+import requests
 from pyalex import Works, Authors, Sources, Institutions, Topics, Publishers, Funders
 from pyalex.api import Work
 from mcp.server.fastmcp import FastMCP, Context # Corrected import
@@ -13,6 +25,10 @@ import mcp.types as mcp_types
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# Tool errors are logged in one line; set OPENALEX_DEBUG=1 to include tracebacks
+_DEBUG_TRACEBACKS = os.getenv("OPENALEX_DEBUG") == "1"
+
+_SERVER_VERSION = "0.1.0"
 
 # --- Configure pyalex ---
 # Use environment variable for email (recommended)
@@ -27,125 +43,461 @@ if OPENALEX_API_KEY:
 
 # Configure retries for robustness
 pyalex.config.max_retries = 3
-pyalex.config.retry_backoff_factor = 0.5
-pyalex.config.retry_http_codes = [429, 500, 503]
+pyalex.config.retry_backoff_factor = 0.2
+pyalex.config.retry_http_codes = [429, 500, 502, 503]
+
+# Headers for direct (non-pyalex) requests: the same From and Authorization headers
+# pyalex sends (see pyalex.api.OpenAlexAuth), with the server's own User-Agent
+_OPENALEX_HEADERS = {"User-Agent": f"openalex-mcp-server/{_SERVER_VERSION}"}
+if OPENALEX_EMAIL:
+    _OPENALEX_HEADERS["From"] = OPENALEX_EMAIL
+if OPENALEX_API_KEY:
+    _OPENALEX_HEADERS["Authorization"] = f"Bearer {OPENALEX_API_KEY}"
+
+# Shared async HTTP client, created lazily inside the running event loop
+_http_client: Optional[httpx.AsyncClient] = None
+
+# --- Rate Limiting ---
+class _RateLimiter:
+    """
+    Spaces out outbound requests to stay under a requests-per-second budget.
+    After a 429 the rate drops to 75% for a short cool-down.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self._next_slot = 0.0
+        self._penalty_until = 0.0
+
+    async def __aenter__(self) -> None:
+        now = time.monotonic()
+        rate = self.rate * 0.75 if now < self._penalty_until else self.rate
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1.0 / rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+    def penalize(self, duration: float = 10.0) -> None:
+        """Slows down for `duration` seconds after the API reports too many requests."""
+        self._penalty_until = time.monotonic() + duration
+
+# OpenAlex allows 10 req/s anonymously and more with an API key; stay just under
+_rate_limiter = _RateLimiter(100 if OPENALEX_API_KEY else 9)
+
+# Worker threads for pyalex's blocking, requests-based calls (the rate limiter, not the pool
+# size, bounds the request rate)
+_DEFAULT_PYALEX_WORKERS = 32
+
+def _pool_size_from_env() -> int:
+    """Reads OPENALEX_POOL_SIZE, falling back to the default (with a warning) on bad values."""
+    raw = os.getenv("OPENALEX_POOL_SIZE", "").strip()
+    if not raw:
+        return _DEFAULT_PYALEX_WORKERS
+    try:
+        size = int(raw)
+    except ValueError:
+        logger.warning("Ignoring OPENALEX_POOL_SIZE=%r (not an integer); using %d.", raw, _DEFAULT_PYALEX_WORKERS)
+        return _DEFAULT_PYALEX_WORKERS
+    if size < 1:
+        logger.warning("OPENALEX_POOL_SIZE=%r is below 1; using 1.", raw)
+        return 1
+    return size
+
+_PYALEX_WORKERS = _pool_size_from_env()
+_pyalex_executor = ThreadPoolExecutor(max_workers=_PYALEX_WORKERS, thread_name_prefix="pyalex")
+
+# pyalex query builders are cheap to construct but build a fresh requests.Session (new
+# connection pool, new TLS handshake) for every request. Give it one shared, pooled session
+# instead; it is created after the retry config above so it keeps the same retry behaviour.
+_pyalex_session = pyalex.api._get_requests_session()
+_pyalex_session.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(
+        max_retries=_pyalex_session.get_adapter("https://").max_retries,
+        pool_maxsize=_PYALEX_WORKERS,
+    ),
+)
+pyalex.api._get_requests_session = lambda: _pyalex_session
+
+async def _run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Runs a blocking pyalex call in a worker thread so the event loop stays responsive."""
+    async with _rate_limiter:
+        return await asyncio.get_running_loop().run_in_executor(_pyalex_executor, func, *args)
 
 # --- MCP Server Setup ---
+_WARMUP_WORK_ID = "W2741809807" # Any stable work; only the connection matters
+_WARMUP_TIMEOUT = 5.0 # Seconds; the warm-up is best effort
+
+# MCP sessions currently inside the lifespan, and the warm-up request started by the first one
+_lifespan_sessions = 0
+_warmup_task: Optional["asyncio.Task[Any]"] = None
+
+async def _warm_up(client: httpx.AsyncClient) -> None:
+    """Sends one request so DNS, TLS and the HTTP/2 connection are set up before the first tool call."""
+    try:
+        # Single attempt without retries; failures only cost the first tool call the setup time
+        await client.get(f"works/{_WARMUP_WORK_ID}", params={"select": "id"}, timeout=_WARMUP_TIMEOUT)
+    except Exception as e:
+        logger.warning("Warm-up request to OpenAlex failed: %s", e)
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """
+    Manages the process-wide HTTP client. FastMCP enters the lifespan once per session
+    (e.g. per SSE connection), so the first session opens and warms the client and the
+    last one to end closes it.
+    """
+    global _http_client, _lifespan_sessions, _warmup_task
+    _lifespan_sessions += 1
+    if _lifespan_sessions == 1:
+        _start_work_batching()
+        # In the background, so a slow API does not hold up the MCP handshake
+        _warmup_task = _spawn(_warm_up(_get_http_client()))
+    try:
+        yield
+    finally:
+        _lifespan_sessions -= 1
+        if _lifespan_sessions == 0:
+            _stop_work_batching()
+            if _warmup_task is not None:
+                _warmup_task.cancel()
+                _warmup_task = None
+            if _http_client is not None:
+                client, _http_client = _http_client, None
+                await client.aclose()
+
 mcp = FastMCP(
     "OpenAlex Works Explorer",
-    version="0.1.0",
+    version=_SERVER_VERSION,
     description="Provides tools to search and retrieve data about scholarly works from OpenAlex.",
     dependencies=[
-        'pyalex'
+        'pyalex',
+        'httpx[http2]',
+        'orjson',
     ],
+    lifespan=_lifespan,
 )
 
-# --- Helper Functions ---
-def _select_fields(item: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
-    """Selects specific root-level fields from a dictionary."""
-    # Ensure essential ID fields are always present if specific fields are requested
-    required_ids = {"id", "doi"} # Add others if needed
-    selected_fields_set = set(fields) | required_ids
+# --- Identifiers ---
+_OPENALEX_URL_PREFIX = "https://openalex.org/"
+_OPENALEX_ID_PREFIXES = (_OPENALEX_URL_PREFIX, "http://openalex.org/", "openalex:")
+# Bare OpenAlex work ID (e.g. W123), matched with fullmatch
+_OPENALEX_WORK_ID = re.compile(r"W\d+", re.IGNORECASE)
+
+def _strip_openalex_prefix(openalex_id: str) -> str:
+    """Turns an OpenAlex ID URL into the bare ID (e.g. W123); other identifiers pass through unchanged."""
+    for prefix in _OPENALEX_ID_PREFIXES:
+        openalex_id = openalex_id.removeprefix(prefix)
+    return openalex_id
+
+# --- Caching ---
+class _TTLCache:
+    """Small in-process LRU cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Returns the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value, evicting the least recently used entry when full."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+# Work metadata changes slowly, so successful lookups are reused for an hour
+_work_details_cache = _TTLCache(maxsize=2048, ttl=3600)
+_referenced_works_cache = _TTLCache(maxsize=2048, ttl=3600)
+# N-grams are derived from a work's full text and effectively never change, so keep them for a week
+_ngrams_cache = _TTLCache(maxsize=4096, ttl=7 * 24 * 3600)
+
+# Lookups currently on the wire, so concurrent identical requests share one fetch
+_inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+async def _coalesce(key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Runs fetch() at most once per key at a time; concurrent callers with the same key
+    await the same task. The task is shielded so one caller cancelling does not fail the others.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+# --- Work Lookup Batching ---
+_WORK_BATCH_SIZE = 50 # OpenAlex accepts up to 50 IDs per ids.openalex filter
+_WORK_BATCH_WINDOW = 0.01 # Seconds to wait for more lookups before dispatching a batch
+_WORK_BATCH_TIMEOUT = 120.0 # Seconds a caller waits for its batch (request timeout plus retries)
+
+# Queued lookups as (work ID, API select fields or None for the full object, caller's future)
+_WorkLookup = Tuple[str, Optional[FrozenSet[str]], "asyncio.Future[Optional[Dict[str, Any]]]"]
+_work_batch_queue: Optional["asyncio.Queue[_WorkLookup]"] = None
+_work_batch_dispatcher_task: Optional["asyncio.Task[Any]"] = None
+_background_tasks: Set["asyncio.Task[Any]"] = set()
+
+def _spawn(coro: Awaitable[Any]) -> "asyncio.Task[Any]":
+    """Starts a background task and keeps a reference to it until it finishes."""
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+def _start_work_batching() -> None:
+    """Creates the lookup queue and its dispatcher on the running event loop (called from the lifespan)."""
+    global _work_batch_queue, _work_batch_dispatcher_task
+    _work_batch_queue = asyncio.Queue()
+    _work_batch_dispatcher_task = _spawn(_work_batch_dispatcher(_work_batch_queue))
+
+def _stop_work_batching() -> None:
+    """Cancels the dispatcher and fails lookups still waiting in the queue."""
+    global _work_batch_queue, _work_batch_dispatcher_task
+    if _work_batch_dispatcher_task is not None:
+        _work_batch_dispatcher_task.cancel()
+        _work_batch_dispatcher_task = None
+    if _work_batch_queue is not None:
+        while not _work_batch_queue.empty():
+            _, _, future = _work_batch_queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Server is shutting down."))
+        _work_batch_queue = None
+
+async def _work_batch_dispatcher(queue: "asyncio.Queue[_WorkLookup]") -> None:
+    """Drains queued lookups into batches of up to _WORK_BATCH_SIZE and dispatches each one."""
+    while True:
+        pending = [await queue.get()]
+        # Give concurrent callers a short window to join this batch
+        if queue.qsize() < _WORK_BATCH_SIZE - 1:
+            await asyncio.sleep(_WORK_BATCH_WINDOW)
+        while len(pending) < _WORK_BATCH_SIZE and not queue.empty():
+            pending.append(queue.get_nowait())
+        _spawn(_dispatch_work_batch(pending))
+
+async def _dispatch_work_batch(pending: List[_WorkLookup]) -> None:
+    """Fetches one batch with a single ids.openalex request and resolves each caller's future."""
+    ids = list(dict.fromkeys(work_id for work_id, _, _ in pending))
+    params = {"filter": f"ids.openalex:{'|'.join(ids)}", "per-page": len(ids)}
+    select_sets = [fields for _, fields, _ in pending]
+    if all(fields is not None for fields in select_sets):
+        # Select the union of requested fields; any full-object request means no select
+        params["select"] = ",".join(sorted(frozenset({"id"}).union(*filter(None, select_sets))))
 
-    return {k: v for k, v in item.items() if k in selected_fields_set}
+    try:
+        payload = await _get_json("works", params)
+        by_id = {_strip_openalex_prefix(record["id"]).upper(): record for record in payload["results"]}
+    except Exception as e:
+        groups: Dict[Optional[FrozenSet[str]], List[_WorkLookup]] = {}
+        for lookup in pending:
+            groups.setdefault(lookup[1], []).append(lookup)
+        client_error = isinstance(e, httpx.HTTPStatusError) and 400 <= e.response.status_code < 500
+        if client_error and "select" in params and len(groups) > 1:
+            # One caller's invalid field fails the merged select; retry each select set on
+            # its own so the error only reaches the callers that asked for that field
+            for group in groups.values():
+                _spawn(_dispatch_work_batch(group))
+            return
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for work_id, _, future in pending:
+        if not future.done():
+            future.set_result(by_id.get(work_id))
+
+async def _get_work(work_id: str, select_fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Fetches a single work. Plain OpenAlex IDs are queued and sent to the API in batches while
+    the server's lifespan is active. Other identifiers (DOI, PMID, MAG), IDs missing from a batch
+    response (e.g. merged works) and lookups made outside the lifespan use the single-work
+    endpoint. The result may contain more fields than requested.
+    """
+    openalex_id = _strip_openalex_prefix(work_id)
+    if _work_batch_queue is not None and _OPENALEX_WORK_ID.fullmatch(openalex_id):
+        future = asyncio.get_running_loop().create_future()
+        _work_batch_queue.put_nowait((openalex_id.upper(), frozenset(select_fields) if select_fields else None, future))
+        # A stalled or cancelled dispatcher surfaces as a TimeoutError instead of a hang
+        record = await asyncio.wait_for(future, _WORK_BATCH_TIMEOUT)
+        if record is not None:
+            return record
+
+    params = {"select": ",".join(select_fields)} if select_fields else None
+    return await _get_json(f"works/{quote_plus(work_id)}", params)
 
-def _process_results(
-    results: List[Dict[str, Any]],
-    select_fields: Optional[List[str]] = None
-) -> List[Dict[str, Any]]:
-    """Processes a list of results for field selection and abstract inversion."""
-    processed = []
-    for item in results:
-        # Convert pyalex object to dict if necessary
-        if not isinstance(item, dict):
-             if hasattr(item, 'to_dict'): # Check if it's a pyalex object
-                 item = item.to_dict()
-             else:
-                 logger.warning(f"Skipping non-dictionary item: {type(item)}")
-                 continue
-
-        # Check if item is a pyalex object (duck typing: check for .items())
-        is_pyalex_obj = hasattr(item, 'items') and callable(item.items)
-
-        # If fetching full object (select_fields is None) and it's a pyalex object,
-        # try to trigger abstract generation *before* converting to dict.
-        generated_abstract = None
-        if select_fields is None and is_pyalex_obj:
-            try:
-                generated_abstract = item["abstract"] # Access abstract on original object
-            except KeyError:
-                logger.warning(f"Abstract could not be generated for {item.get('id')}, index likely missing.")
-            except Exception as gen_err:
-                logger.error(f"Error during abstract generation for {item.get('id')}: {gen_err}")
-
-        # Convert to dict *after* potential abstract access
-        if is_pyalex_obj:
-            dict_item = dict(item.items())
+# --- Helper Functions ---
+def _get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared async HTTP client, creating it on first use.
+    HTTP/2 lets concurrent lookups share a single TLS connection to the API.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            base_url=pyalex.config.openalex_url,
+            headers=_OPENALEX_HEADERS,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            # Merged works answer with a 301 to the surviving work, as requests follows by default
+            follow_redirects=True,
+        )
+    return _http_client
+
+async def _get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Performs a GET against the OpenAlex API without blocking the event loop.
+    Retries follow the pyalex config (max_retries, retry_backoff_factor, retry_http_codes).
+    """
+    max_retries = pyalex.config.max_retries
+    for attempt in range(max_retries + 1):
+        try:
+            async with _rate_limiter:
+                response = await _get_http_client().get(path, params=params)
+        except httpx.TransportError as e:
+            if attempt == max_retries:
+                raise
+            logger.warning("Transport error for %s, retrying: %s", path, e)
         else:
-            dict_item = item # Assume it's already a dict
-
-        # Ensure abstract is correctly placed in the dictionary if generated
-        if generated_abstract is not None:
-             dict_item["abstract"] = generated_abstract
-        elif select_fields is None and "abstract" not in dict_item:
-             # Ensure key exists as None if full object requested but abstract failed/missing
-             dict_item["abstract"] = None
+            if response.status_code not in pyalex.config.retry_http_codes or attempt == max_retries:
+                response.raise_for_status()
+                return orjson.loads(response.content)
+            if response.status_code == 429:
+                _rate_limiter.penalize()
+            logger.warning("HTTP %s for %s, retrying.", response.status_code, path)
+        await asyncio.sleep(pyalex.config.retry_backoff_factor * (2 ** attempt))
+    raise RuntimeError("unreachable") # Loop always returns or raises
+
+def _json_text_content(payload: Any) -> mcp_types.TextContent:
+    """
+    Serializes a payload to compact JSON with orjson. FastMCP would otherwise encode
+    returned dicts itself, indented, which bloats large payloads such as N-gram lists.
+    """
+    return mcp_types.TextContent(type="text", text=orjson.dumps(payload).decode())
 
-        # Apply field selection if requested
-        if select_fields:
-            processed.append(_select_fields(dict_item, select_fields))
-        else:
-            # Append the full (potentially abstract-added) dictionary
-            processed.append(dict_item)
+# Result dicts built by the helpers below reference the source record's values instead of
+# copying them, since tool output is serialized straight away. Records can be shared between
+# batched callers and the caches, so nested values must never be mutated in place.
 
-    return processed
+# Essential ID fields that are always present if specific fields are requested
+_REQUIRED_IDS = frozenset({"id", "doi"})
 
-def _summarize_work(work_dict: Dict[str, Any], select_fields: Optional[List[str]] = None) -> Dict[str, Any]:
+def _select_fields(item: Dict[str, Any], fields: FrozenSet[str]) -> Dict[str, Any]:
     """
-    Condenses a full work dictionary into a summary, potentially filtered by select_fields.
+    Selects specific root-level fields from a dictionary (a new dict sharing the item's values).
+    Callers build `fields` once (including _REQUIRED_IDS) and reuse it across items.
     """
-    # Define the potential fields for the summary
-    summary_data = {}
-
-    # --- Extract potential summary fields ---
-    summary_data["id"] = work_dict.get("id")
-    summary_data["doi"] = work_dict.get("doi")
-    summary_data["title"] = work_dict.get("title")
-    summary_data["publication_year"] = work_dict.get("publication_year")
-    # Fix duplication and limit to max 6 authors
-    summary_data["authors"] = [
-        authorship.get("author", {}).get("display_name")
-        for authorship in work_dict.get("authorships", []) # Corrected: single loop
-        if authorship.get("author", {}).get("display_name")
-    ][:6] # Limit to 6
-    summary_data["cited_by_count"] = work_dict.get("cited_by_count")
+    return {k: v for k, v in item.items() if k in fields}
+
+def _invert_abstract(inverted_index: Optional[Dict[str, List[int]]]) -> Optional[str]:
+    """Reconstructs a plaintext abstract from an OpenAlex abstract_inverted_index."""
+    if not inverted_index:
+        return None
+    # Preallocate to the highest position so each word is placed in a single pass
+    size = max((max(positions) for positions in inverted_index.values() if positions), default=-1) + 1
+    words = [""] * size
+    for word, positions in inverted_index.items():
+        for pos in positions:
+            words[pos] = word
+    return " ".join(words)
 
-    venue_source = work_dict.get("primary_location", {}).get("source", {})
-    summary_data["venue"] = venue_source.get("display_name") if venue_source else None
+def _process_results(
+    results: List[Dict[str, Any]],
+    select_fields: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Processes a list of results for field selection and abstract inversion."""
+    # pyalex entities are dict subclasses; anything else is expected to offer to_dict()
+    dicts = [item if isinstance(item, dict) else item.to_dict() for item in results]
 
-    # Determine best OA URL
-    summary_data["oa_url"] = None
+    # If fetching the full object, build the plaintext abstract from the inverted index
+    if select_fields is None:
+        for item in dicts:
+            if "abstract" not in item:
+                item["abstract"] = _invert_abstract(item.get("abstract_inverted_index"))
+
+    # Apply field selection if requested
+    if not select_fields:
+        return dicts
+    fields = frozenset(select_fields) | _REQUIRED_IDS
+    return [_select_fields(item, fields) for item in dicts]
+
+# Source fields read by _summarize_work, so summarizing queries can select only these
+_SUMMARY_API_FIELDS = [
+    "id", "doi", "title", "publication_year", "authorships", "cited_by_count",
+    "primary_location", "best_oa_location", "open_access", "abstract_inverted_index",
+]
+
+def _summary_authors(work_dict: Dict[str, Any]) -> List[str]:
+    # Limit to max 6 authors, stopping early on papers with very long author lists
+    return list(islice(
+        (
+            authorship["author"]["display_name"]
+            for authorship in work_dict.get("authorships") or ()
+            if (authorship.get("author") or {}).get("display_name")
+        ),
+        6,
+    ))
+
+def _summary_venue(work_dict: Dict[str, Any]) -> Optional[str]:
+    venue_source = (work_dict.get("primary_location") or {}).get("source")
+    return venue_source.get("display_name") if venue_source else None
+
+def _summary_oa_url(work_dict: Dict[str, Any]) -> Optional[str]:
+    # Prefer the best OA location's PDF, then the general OA URL
     best_oa = work_dict.get("best_oa_location")
     if best_oa and best_oa.get("pdf_url"):
-        summary_data["oa_url"] = best_oa.get("pdf_url")
-    elif work_dict.get("open_access", {}).get("oa_url"):
-         summary_data["oa_url"] = work_dict.get("open_access", {}).get("oa_url")
-
-    # Abstract should be generated by pyalex when accessed if full object fetched
-    summary_data["abstract"] = work_dict.get("abstract") # Accessing this might trigger generation
-    # --- End Extraction ---
-
-    # Determine which fields to include in the final summary
-    default_summary_keys = set(summary_data.keys())
-    if select_fields is None:
-        keys_to_include = default_summary_keys
-    else:
-        keys_to_include = default_summary_keys.intersection(set(select_fields))
+        return best_oa.get("pdf_url")
+    return (work_dict.get("open_access") or {}).get("oa_url")
+
+# Summary fields and how to extract each from a full work dictionary, built once at import
+_SUMMARY_ACCESSORS: Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...] = (
+    ("id", methodcaller("get", "id")),
+    ("doi", methodcaller("get", "doi")),
+    ("title", methodcaller("get", "title")),
+    ("publication_year", methodcaller("get", "publication_year")),
+    ("authors", _summary_authors),
+    ("cited_by_count", methodcaller("get", "cited_by_count")),
+    ("venue", _summary_venue),
+    ("oa_url", _summary_oa_url),
+    ("abstract", methodcaller("get", "abstract")),
+)
+_DEFAULT_SUMMARY_KEYS = frozenset(key for key, _ in _SUMMARY_ACCESSORS)
 
-    # Construct final summary dictionary
-    final_summary = {key: summary_data[key] for key in keys_to_include if summary_data[key] is not None}
+def _summary_keys(select_fields: Optional[List[str]] = None) -> FrozenSet[str]:
+    """Builds the set of summary fields to include; callers compute this once per page."""
+    return _DEFAULT_SUMMARY_KEYS if select_fields is None else frozenset(select_fields)
 
-    return final_summary
+def _summarize_work(work_dict: Dict[str, Any], summary_keys: FrozenSet[str] = _DEFAULT_SUMMARY_KEYS) -> Dict[str, Any]:
+    """
+    Condenses a full work dictionary into a summary, limited to the fields in summary_keys.
+    """
+    return {
+        key: value
+        for key, accessor in _SUMMARY_ACCESSORS
+        if key in summary_keys and (value := accessor(work_dict)) is not None
+    }
 
 # --- MCP Tools ---
 
@@ -205,25 +557,12 @@ async def search_works(
         else:
             raise ValueError(f"Invalid search_field: {search_field}")
 
-        logging.info(f"{query.count()} number of results found pre filters")
-
         # Apply filters
         if filters:
-            # pyalex expects filters as keyword arguments
-            # Need to handle nested filters like authorships.institutions.ror
-            processed_filters = {}
-            for key, value in filters.items():
-                # Basic handling for nested keys, pyalex might need dicts for these
-                if '.' in key:
-                     # pyalex handles nested filters via dicts passed as kwargs
-                     # e.g. authorships={"institutions": {"ror": "value"}}
-                     # We assume the user provides the filter key correctly for pyalex
-                     # This might need refinement based on how pyalex expects complex filters
-                     logger.warning(f"Nested filter key '{key}' passed directly. Ensure pyalex compatibility.")
-                     processed_filters[key] = value # Pass as is, pyalex might handle it
-                else:
-                    processed_filters[key] = value
-            query = query.filter(**processed_filters)
+            # pyalex flattens filters into "key:value" pairs, and a dotted key such as
+            # authorships.institutions.ror produces the same string as the equivalent
+            # nested dict, so filters can be passed through unchanged
+            query = query.filter(**filters)
 
         # Apply sorting
         if sort:
@@ -232,9 +571,12 @@ async def search_works(
         # Determine if we need to select specific fields based on summarize_results
         if not summarize_results and select_fields:
             # Only apply select_fields if summarization is OFF and fields are provided
-            logger.info(f"Summarization off, selecting fields: {select_fields}")
+            logger.info("Summarization off, selecting fields: %s", select_fields)
             query = query.select(select_fields)
-        # Otherwise (summarize=True OR select_fields=None), fetch the full object
+        elif summarize_results:
+            # Only fetch the fields the summary is built from
+            query = query.select(_SUMMARY_API_FIELDS)
+        # Otherwise (summarize=False and select_fields=None), fetch the full object
 
         # Execute paginated query
         # pyalex paginate returns an iterator of pages
@@ -242,9 +584,9 @@ async def search_works(
 
         page_results = []
         metadata = {}
-        try:
-            # Get the first (and only requested) page
-            first_page = next(pager)
+        # Get the first (and only requested) page; None means no results for this cursor/query
+        first_page = await _run_blocking(next, pager, None)
+        if first_page is not None:
             page_results = first_page
             # Extract metadata which includes the next cursor
             if hasattr(first_page, 'meta'):
@@ -258,15 +600,16 @@ async def search_works(
                          raw_meta_response = await query._get_meta()
                          metadata = raw_meta_response.get('meta', {})
                      except Exception as meta_err:
-                         logger.warning(f"Could not retrieve metadata via internal fallback: {meta_err}")
+                         logger.warning("Could not retrieve metadata via internal fallback: %s", meta_err)
                  else:
                      logger.warning("Could not retrieve pagination metadata.")
-
-        except StopIteration:
-            # No results found for this cursor/query
+        else:
             logger.info("No results found for the current page.")
             metadata = {'count': 0, 'page': 1, 'per_page': per_page, 'next_cursor': None} # Synthesize meta
 
+        # The page's own metadata carries the total, so no separate count request is needed
+        logger.info("%s number of results found", metadata.get("count"))
+
         # Process results (convert to dict, potentially trigger abstract generation)
         # Pass select_fields=None to _process_results because if fields were selected,
         # pyalex did it during the query. If not, we need the full dict processed.
@@ -274,8 +617,9 @@ async def search_works(
 
         # Apply summarization if requested
         if summarize_results:
-            # Pass select_fields to the summarizer to filter the summary
-            final_results = [_summarize_work(item, select_fields) for item in processed_page_results]
+            # Use select_fields to filter the summary
+            summary_keys = _summary_keys(select_fields)
+            final_results = [_summarize_work(item, summary_keys) for item in processed_page_results]
         else:
             # If not summarizing, the results are already processed (either full or selected by pyalex)
             final_results = processed_page_results
@@ -292,10 +636,51 @@ async def search_works(
         return response
 
     except Exception as e:
-        logger.exception(f"Error in search_works: {e}")
+        logger.error("Error in search_works: %s", e, exc_info=_DEBUG_TRACEBACKS)
         # Return error information in a structured way if possible
         return {"error": str(e), "results": [], "meta": {}}
 
+async def _fetch_work_details(work_id: str, select_fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Fetches a single work and builds the get_work_details result (uncached)."""
+    final_result = {}
+    # Determine if we need the full object (for abstract generation or full details)
+    fetch_full_object = not select_fields or (select_fields and "abstract" in select_fields)
+
+    if fetch_full_object:
+        # 'abstract' is not an API field, so select the inverted index in its place
+        api_select = None
+        if select_fields:
+            api_select = sorted((set(select_fields) - {"abstract"}) | {"id", "doi", "abstract_inverted_index"})
+        logger.info("Fetching work object for abstract generation or full details.")
+        work_data = await _get_work(work_id, api_select)
+        if not work_data: return {"error": f"Work not found: {work_id}"}
+
+        # None if abstract_inverted_index is missing/null
+        abstract = _invert_abstract(work_data.get("abstract_inverted_index"))
+
+        # Drop the index if the abstract exists and the index wasn't explicitly requested
+        fields = frozenset(select_fields) | _REQUIRED_IDS if select_fields else frozenset(work_data)
+        if abstract is not None and not (select_fields and "abstract_inverted_index" in select_fields):
+            fields -= {"abstract_inverted_index"}
+
+        # A batched record may be shared with other callers, so build a new dict around
+        # its values (applying the user's selection, if any) instead of mutating it
+        final_result = _select_fields(work_data, fields)
+        final_result["abstract"] = abstract
+
+    else:
+        # Abstract not requested, use the API's select for efficiency
+        logger.info("Abstract not requested, using select for efficiency.")
+        # Ensure essential IDs are always included
+        query_select = frozenset(select_fields or ()) | _REQUIRED_IDS
+        work_data = await _get_work(work_id, list(query_select))
+        if not work_data: return {"error": f"Work not found: {work_id}"}
+
+        # A batched lookup may carry fields requested by other callers
+        final_result = _select_fields(work_data, query_select)
+
+    return final_result
+
 @mcp.tool()
 async def get_work_details(
     ctx: Context,
@@ -314,63 +699,27 @@ async def get_work_details(
     Returns:
         A dictionary containing the work details or an error message.
     """
-    try:
-        final_result = {}
-        # Determine if we need the full object (for abstract generation or full details)
-        fetch_full_object = not select_fields or (select_fields and "abstract" in select_fields)
-
-        if fetch_full_object:
-            logger.info("Fetching full work object for abstract generation or full details.")
-            work_data: Work = Works()[work_id]
-            if not work_data: return {"error": f"Work not found: {work_id}"}
-
-            # Create a base dictionary from the Work object's items
-            # This captures all readily available fields
-            work_dict = dict(work_data.items())
-
-            # Separately attempt to generate and add the abstract
-            try:
-                # Accessing work_data['abstract'] triggers pyalex's internal generation
-                generated_abstract = work_data["abstract"]
-                work_dict["abstract"] = generated_abstract # Add/overwrite abstract in our dict
-            except KeyError:
-                 # This might happen if abstract_inverted_index is missing/null
-                 logger.warning(f"Abstract could not be generated for {work_id}, index likely missing.")
-                 work_dict["abstract"] = None # Ensure abstract field exists as None
-            except Exception as gen_err:
-                 logger.error(f"Error during abstract generation for {work_id}: {gen_err}")
-                 work_dict["abstract"] = None # Ensure abstract field exists as None
-
-            # Apply user's selection if provided
-            if select_fields:
-                final_result = _select_fields(work_dict, select_fields)
-            else:
-                final_result = work_dict # Use the full dictionary
-
-            # Remove index if abstract exists and index wasn't explicitly requested
-            should_remove_index = (
-                "abstract" in final_result and final_result.get("abstract") is not None and
-                "abstract_inverted_index" in final_result and
-                (not select_fields or "abstract_inverted_index" not in select_fields)
-            )
-            if should_remove_index:
-                del final_result["abstract_inverted_index"]
-
-        else:
-            # Abstract not requested, use pyalex select() for efficiency
-            logger.info("Abstract not requested, using pyalex select() for efficiency.")
-            # Ensure essential IDs are always included
-            query_select = list(set(select_fields) | {"id", "doi"})
-            work_data: Work = Works().select(query_select)[work_id]
-            if not work_data: return {"error": f"Work not found: {work_id}"}
-
-            # Convert selected data to dict
-            final_result = dict(work_data.items())
+    # OpenAlex IDs share one cache entry however they are written (URL, case);
+    # other identifiers (DOI, PMID, MAG) are keyed as given
+    openalex_id = _strip_openalex_prefix(work_id)
+    lookup_id = openalex_id.upper() if _OPENALEX_WORK_ID.fullmatch(openalex_id) else work_id
+    fields_key = tuple(sorted(select_fields)) if select_fields else None
+    cache_key = (lookup_id, fields_key)
+    cached_result = _work_details_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    async def fetch_and_cache() -> Dict[str, Any]:
+        result = await _fetch_work_details(lookup_id, list(fields_key) if fields_key else None)
+        if "error" not in result:
+            _work_details_cache.set(cache_key, result)
+        return result
 
-        return final_result
+    try:
+        return await _coalesce(("work_details", cache_key), fetch_and_cache)
 
     except Exception as e:
-        logger.exception(f"Error in get_work_details for ID {work_id}: {e}")
+        logger.error("Error in get_work_details for ID %s: %s", work_id, e, exc_info=_DEBUG_TRACEBACKS)
         return {"error": str(e)}
 
 # --- New Batch Tool ---
@@ -382,35 +731,35 @@ async def get_batch_work_details(
 ) -> Dict[str, Any]:
     """
     Retrieves detailed information for a list of OpenAlex works by their IDs.
-    Limited to a maximum of 50 IDs per request due to API limitations.
+    Limited to a maximum of 50 distinct IDs per request due to API limitations.
 
     Args:
-        work_ids: A list of OpenAlex work identifiers (max 50).
+        work_ids: A list of OpenAlex work identifiers (max 50 distinct IDs).
         select_fields: List of root-level fields to return for each work.
                        See OpenAlex docs for options. If omitted, returns full objects.
 
     Returns:
         A dictionary containing a list of work details under the 'works' key,
+        in the same order as work_ids (null for IDs that were not found),
         or an error message.
     """
     MAX_IDS = 50
     if not work_ids:
         return {"error": "work_ids list cannot be empty.", "works": []}
-    if len(work_ids) > MAX_IDS:
+
+    # Clean IDs (remove potential URL prefixes)
+    cleaned_ids = list(map(_strip_openalex_prefix, work_ids))
+    # Duplicates (including case variants) are fetched once and fanned back out to their positions below
+    unique_ids = list(dict.fromkeys(_id.upper() for _id in cleaned_ids))
+    if len(unique_ids) > MAX_IDS:
         return {"error": f"Too many work_ids provided. Maximum is {MAX_IDS}.", "works": []}
 
     try:
-        # Clean IDs (remove potential URL prefixes)
-        cleaned_ids = [
-            _id.split("/")[-1] if _id.startswith("https://openalex.org/") else _id
-            for _id in work_ids
-        ]
-
-        # Construct the filter string for the API
-        id_filter = {"ids": {"openalex": "|".join(cleaned_ids)}}
-
-        # Build the query
-        query = Works().filter(**id_filter)
+        # Construct the query parameters for the API
+        params = {
+            "filter": f"ids.openalex:{'|'.join(unique_ids)}",
+            "per-page": len(unique_ids), # Default page size would truncate larger batches
+        }
 
         # Check if abstract is requested and handle it specially
         abstract_requested = False
@@ -432,72 +781,30 @@ async def get_batch_work_details(
                 api_select_fields = ["id"] + api_select_fields
                 
             # Apply field selection to the query
-            query = query.select(api_select_fields)
+            params["select"] = ",".join(api_select_fields)
         
-        # Fetch all results for the given IDs.
-        results_list = query.get() # Use get() which returns a list
+        # Fetch all results for the given IDs without blocking the event loop.
+        payload = await _get_json("works", params)
+
+        # Fields to keep in each result; abstract is generated locally so it is added back here
+        result_fields = None
+        if select_fields:
+            result_fields = frozenset(api_select_fields or ()) | _REQUIRED_IDS
+            if abstract_requested:
+                result_fields |= {"abstract"}
 
         # For each work, process the abstract if it was requested
         processed_results = []
-        for work in results_list:
-            # Convert to dict if needed
-            if not isinstance(work, dict):
-                if hasattr(work, 'to_dict'):
-                    work_dict = work.to_dict()
-                elif hasattr(work, 'items') and callable(work.items):
-                    work_dict = dict(work.items())
-                else:
-                    logger.warning(f"Skipping non-dictionary item: {type(work)}")
-                    continue
-            else:
-                work_dict = work
-
+        for work_dict in payload["results"]:
             # Generate abstract if it was requested or if no fields were specified
             if abstract_requested or not select_fields:
-                if "abstract_inverted_index" in work_dict:
-                    try:
-                        # Try to access the abstract to trigger pyalex's generation
-                        if hasattr(work, "__getitem__"):
-                            generated_abstract = work["abstract"]
-                        else:
-                            # Try to generate from the inverted index
-                            # This is a fallback if direct access doesn't work
-                            inverted_index = work_dict.get("abstract_inverted_index")
-                            if inverted_index:
-                                # Simple reconstruction of abstract from inverted index
-                                # This is a basic implementation - pyalex might do something more sophisticated
-                                words = []
-                                for word, positions in inverted_index.items():
-                                    for pos in positions:
-                                        while len(words) <= pos:
-                                            words.append("")
-                                        words[pos] = word
-                                generated_abstract = " ".join(words)
-                            else:
-                                generated_abstract = None
-                        
-                        # Store the generated abstract
-                        work_dict["abstract"] = generated_abstract
-                    except KeyError:
-                        logger.warning(f"Abstract could not be generated for {work_dict.get('id')}, index likely missing.")
-                        work_dict["abstract"] = None
-                    except Exception as gen_err:
-                        logger.error(f"Error during abstract generation for {work_dict.get('id')}: {gen_err}")
-                        work_dict["abstract"] = None
-                else:
-                    # No inverted index available
-                    logger.warning(f"No abstract_inverted_index available for {work_dict.get('id')}")
-                    work_dict["abstract"] = None
+                if "abstract_inverted_index" not in work_dict:
+                    logger.warning("No abstract_inverted_index available for %s", work_dict.get("id"))
+                work_dict["abstract"] = _invert_abstract(work_dict.get("abstract_inverted_index"))
 
             # Create the result dictionary based on the requested fields
-            if select_fields:
-                # If abstract was requested but filtered out for the API query,
-                # we need to add it back to the select_fields for _select_fields
-                if abstract_requested:
-                    select_fields_with_abstract = list(api_select_fields) + ["abstract"]
-                    result = _select_fields(work_dict, select_fields_with_abstract)
-                else:
-                    result = _select_fields(work_dict, api_select_fields)
+            if result_fields:
+                result = _select_fields(work_dict, result_fields)
             else:
                 result = work_dict
 
@@ -510,11 +817,12 @@ async def get_batch_work_details(
 
             processed_results.append(result)
 
-        # Return the list of work details
-        return {"works": processed_results}
+        # Return the list of work details in request order
+        by_id = {_strip_openalex_prefix(work["id"]).upper(): work for work in processed_results}
+        return {"works": [by_id.get(_id.upper()) for _id in cleaned_ids]}
 
     except Exception as e:
-        logger.exception(f"Error in get_batch_work_details for IDs {work_ids}: {e}")
+        logger.error("Error in get_batch_work_details for IDs %s: %s", work_ids, e, exc_info=_DEBUG_TRACEBACKS)
         # Consider more specific error handling if pyalex raises identifiable errors
         return {"error": str(e), "works": []}
 # --- End New Batch Tool ---
@@ -537,17 +845,44 @@ async def get_referenced_works(
     """
     try:
         # Ensure work_id is just the ID part if a full URL is passed
-        if work_id.startswith("https://openalex.org/"):
-            work_id = work_id.split("/")[-1]
+        work_id = _strip_openalex_prefix(work_id)
+        # OpenAlex IDs share one cache entry regardless of case, as in get_work_details
+        lookup_id = work_id.upper() if _OPENALEX_WORK_ID.fullmatch(work_id) else work_id
+
+        cached_result = _referenced_works_cache.get(lookup_id)
+        if cached_result is not None:
+            return cached_result
 
-        # Only select the referenced_works field to reduce token usage
-        work_data = Works().select(["referenced_works"])[work_id]
-        referenced_ids = work_data.get("referenced_works", [])
-        return {"referenced_work_ids": referenced_ids}
+        async def fetch_and_cache() -> Dict[str, Any]:
+            # Only select the referenced_works field to reduce token usage (batched like get_work_details)
+            work_data = await _get_work(lookup_id, ["referenced_works"])
+            result = {"referenced_work_ids": work_data.get("referenced_works", [])}
+            _referenced_works_cache.set(lookup_id, result)
+            return result
+
+        return await _coalesce(("referenced_works", lookup_id), fetch_and_cache)
 
     except Exception as e:
-        logger.exception(f"Error in get_referenced_works for ID {work_id}: {e}")
+        logger.error("Error in get_referenced_works for ID %s: %s", work_id, e, exc_info=_DEBUG_TRACEBACKS)
         return {"error": str(e), "referenced_work_ids": []}
+
+@mcp.tool()
+async def cache_clear(
+    ctx: Context,
+) -> Dict[str, Any]:
+    """
+    Clears the in-process caches used by get_work_details, get_referenced_works and get_work_ngrams.
+    Use this if cached results are suspected to be stale.
+
+    Returns:
+        A dictionary reporting how many cached entries were dropped.
+    """
+    cleared = len(_work_details_cache) + len(_referenced_works_cache) + len(_ngrams_cache)
+    _work_details_cache.clear()
+    _referenced_works_cache.clear()
+    _ngrams_cache.clear()
+    return {"cleared_entries": cleared}
+
 @mcp.tool()
 async def get_citing_works(
     ctx: Context, # Changed ToolContext to Context
@@ -578,30 +913,34 @@ async def get_citing_works(
     """
     try:
         # Ensure work_id is just the ID part if a full URL is passed
-        if work_id.startswith("https://openalex.org/"):
-            work_id = work_id.split("/")[-1]
+        work_id = _strip_openalex_prefix(work_id)
+        # The cites filter only takes OpenAlex work IDs; reject anything else without an API call
+        if not _OPENALEX_WORK_ID.fullmatch(work_id):
+            return {"error": f"Invalid OpenAlex work ID: {work_id}.", "results": [], "meta": {}}
 
         query = Works().filter(cites=work_id)
 
         # Determine if we need to select specific fields based on summarize_results
         if not summarize_results and select_fields:
             # Only apply select_fields if summarization is OFF and fields are provided
-            logger.info(f"Summarization off, selecting fields for citing works: {select_fields}")
+            logger.info("Summarization off, selecting fields for citing works: %s", select_fields)
             query = query.select(select_fields)
         elif not summarize_results and not select_fields:
             # Summarization off, no fields specified - use default summary fields for efficiency
-            default_summary_fields = ["id", "doi", "title", "publication_year", "authorships", "cited_by_count", "primary_location", "open_access", "abstract"]
-            logger.info(f"Summarization off, no fields specified, selecting default summary fields: {default_summary_fields}")
+            default_summary_fields = ["id", "doi", "title", "publication_year", "authorships", "cited_by_count", "primary_location", "open_access", "abstract_inverted_index"]
+            logger.info("Summarization off, no fields specified, selecting default summary fields: %s", default_summary_fields)
             query = query.select(default_summary_fields)
-        # Otherwise (summarize=True), fetch the full object to allow summarization
+        else:
+            # Summarizing: only fetch the fields the summary is built from
+            query = query.select(_SUMMARY_API_FIELDS)
 
         # Execute paginated query
         pager = query.paginate(per_page=per_page, cursor=cursor, n_max=per_page)
 
         page_results = []
         metadata = {}
-        try:
-            first_page = next(pager)
+        first_page = await _run_blocking(next, pager, None)
+        if first_page is not None:
             page_results = first_page
             if hasattr(first_page, 'meta'):
                  metadata = first_page.meta
@@ -612,12 +951,11 @@ async def get_citing_works(
                          raw_meta_response = await query._get_meta()
                          metadata = raw_meta_response.get('meta', {})
                      except Exception as meta_err:
-                         logger.warning(f"Could not retrieve metadata via internal fallback: {meta_err}")
+                         logger.warning("Could not retrieve metadata via internal fallback: %s", meta_err)
                  else:
                      logger.warning("Could not retrieve pagination metadata.")
-
-        except StopIteration:
-            logger.info(f"No citing works found for page with cursor {cursor}.")
+        else:
+            logger.info("No citing works found for page with cursor %s.", cursor)
             metadata = {'count': 0, 'page': 1, 'per_page': per_page, 'next_cursor': None} # Synthesize meta
 
         # Process results (convert to dict, potentially trigger abstract generation)
@@ -627,8 +965,9 @@ async def get_citing_works(
 
         # Apply summarization if requested
         if summarize_results:
-            # Pass original select_fields to the summarizer to filter the summary
-            final_results = [_summarize_work(item, select_fields) for item in processed_page_results]
+            # Use original select_fields to filter the summary
+            summary_keys = _summary_keys(select_fields)
+            final_results = [_summarize_work(item, summary_keys) for item in processed_page_results]
         else:
             # If not summarizing, the results are already processed (either full or selected by pyalex)
             final_results = processed_page_results
@@ -644,41 +983,148 @@ async def get_citing_works(
         return response
 
     except Exception as e:
-        logger.exception(f"Error in get_citing_works for ID {work_id}: {e}")
+        logger.error("Error in get_citing_works for ID %s: %s", work_id, e, exc_info=_DEBUG_TRACEBACKS)
         return {"error": str(e), "results": [], "meta": {}}
+
+_NGRAMS_BATCH_CONCURRENCY = 25 # Concurrent requests per get_works_ngrams_batch call
+
+async def _fetch_ngrams(work_id: str) -> Dict[str, Any]:
+    """
+    Fetches the N-grams for a work ID (prefix already stripped), using the cache.
+    Only successful responses are cached; errors propagate to the caller.
+    """
+    # The ngrams endpoint only takes OpenAlex work IDs; reject anything else without an API call
+    if not _OPENALEX_WORK_ID.fullmatch(work_id):
+        raise ValueError(f"Invalid OpenAlex work ID: {work_id}.")
+    cache_key = work_id.upper()
+    cached_result = _ngrams_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+
+    async def fetch_and_cache() -> Dict[str, Any]:
+        # Same endpoint as pyalex's Work.ngrams(), fetched on the shared async client
+        result = await _get_json(f"works/{quote_plus(cache_key)}/ngrams")
+        _ngrams_cache.set(cache_key, result)
+        return result
+
+    return await _coalesce(("ngrams", cache_key), fetch_and_cache)
+
+def _project_ngrams(
+    ngrams_data: Dict[str, Any],
+    fields: Optional[FrozenSet[str]],
+    max_ngrams: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Keeps the max_ngrams records with the highest term_frequency (if given), then only the
+    given keys of each record. The ngrams endpoint has no select or limit parameters, so this
+    happens here; the cached payload itself is left intact.
+    """
+    if (not fields and max_ngrams is None) or "ngrams" not in ngrams_data:
+        return ngrams_data
+    records = ngrams_data["ngrams"]
+    if max_ngrams is not None:
+        records = heapq.nlargest(max_ngrams, records, key=lambda record: record.get("term_frequency") or 0)
+    if fields:
+        records = [_select_fields(record, fields) for record in records]
+    return {**ngrams_data, "ngrams": records}
+
+def _ngrams_error(tool_name: str, work_id: str, e: BaseException) -> Dict[str, Any]:
+    """Logs an N-gram fetch failure and maps it to the tool's error object."""
+    # 404 means OpenAlex has no N-grams for the work (_get_json raises httpx.HTTPStatusError);
+    # that is expected for works without full text, so it is not logged as an error.
+    # Retryable statuses were already retried there, so anything else is reported as-is
+    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404:
+        logger.info("No N-grams found for work ID %s.", work_id)
+        return {"error": f"N-grams not found for work ID {work_id}."}
+    logger.error("Error in %s for ID %s: %s", tool_name, work_id, e, exc_info=e if _DEBUG_TRACEBACKS else False)
+    return {"error": str(e)}
+
 @mcp.tool()
 async def get_work_ngrams(
     ctx: Context, # Changed ToolContext to Context
     work_id: str,
-) -> Dict[str, Any]:
+    fields: Optional[List[str]] = None,
+    max_ngrams: Optional[int] = None,
+) -> Union[mcp_types.TextContent, Dict[str, Any]]:
     """
     Retrieves the N-grams (word proximity information) for a specific OpenAlex work's full text.
 
     Args:
         work_id: OpenAlex ID of the work.
+        fields: Keys to keep in each N-gram record, from "ngram", "ngram_count",
+                "ngram_tokens" and "term_frequency". If omitted, returns full records.
+        max_ngrams: If given, returns only this many N-grams, those with the highest
+                    term_frequency, in descending order. If omitted, returns all N-grams.
 
     Returns:
         A dictionary containing the N-gram data or an error message.
     """
     try:
         # Ensure work_id is just the ID part if a full URL is passed
-        if work_id.startswith("https://openalex.org/"):
-            work_id = work_id.split("/")[-1]
+        work_id = _strip_openalex_prefix(work_id)
 
-        # pyalex provides ngrams() method on a Work object
-        ngrams_data = Works()[work_id].ngrams()
-        return ngrams_data # Should already be a dictionary
+        ngrams_data = await _fetch_ngrams(work_id)
+        return _json_text_content(_project_ngrams(ngrams_data, frozenset(fields or ()), max_ngrams))
 
     except Exception as e:
-        logger.exception(f"Error in get_work_ngrams for ID {work_id}: {e}")
-        # Check if it's a known pyalex/API error (e.g., 404 Not Found if ngrams don't exist)
-        # pyalex might raise requests.exceptions.HTTPError
-        if hasattr(e, 'response') and e.response.status_code == 404:
-             return {"error": f"N-grams not found for work ID {work_id}."}
-        return {"error": str(e)}
+        return _ngrams_error("get_work_ngrams", work_id, e)
+
+@mcp.tool()
+async def get_works_ngrams_batch(
+    ctx: Context,
+    work_ids: List[str],
+    fields: Optional[List[str]] = None,
+    max_ngrams: Optional[int] = None,
+) -> Union[mcp_types.TextContent, Dict[str, Any]]:
+    """
+    Retrieves the N-grams for several OpenAlex works concurrently.
+    Limited to a maximum of 50 distinct IDs per request.
+
+    Args:
+        work_ids: A list of OpenAlex work identifiers (max 50 distinct IDs).
+        fields: Keys to keep in each N-gram record (see get_work_ngrams).
+                If omitted, returns full records.
+        max_ngrams: If given, returns only this many N-grams per work, those with the
+                    highest term_frequency. If omitted, returns all N-grams.
+
+    Returns:
+        A dictionary containing a list under the 'ngrams' key, in the same order as
+        work_ids, where each entry is the N-gram data or an error object for that work.
+    """
+    MAX_IDS = 50
+    if not work_ids:
+        return {"error": "work_ids list cannot be empty.", "ngrams": []}
+
+    cleaned_ids = list(map(_strip_openalex_prefix, work_ids))
+    # Duplicates (including case variants) are fetched once and fanned back out below;
+    # the first spelling of each ID is kept so errors name the ID the caller sent
+    first_spelling: Dict[str, str] = {}
+    for _id in cleaned_ids:
+        first_spelling.setdefault(_id.upper(), _id)
+    unique_ids = list(first_spelling.values())
+    if len(unique_ids) > MAX_IDS:
+        return {"error": f"Too many work_ids provided. Maximum is {MAX_IDS}.", "ngrams": []}
+
+    # Bounded so one batch does not flood the connection pool
+    semaphore = asyncio.Semaphore(_NGRAMS_BATCH_CONCURRENCY)
+
+    async def fetch_one(_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await _fetch_ngrams(_id)
+
+    results = await asyncio.gather(*map(fetch_one, unique_ids), return_exceptions=True)
+    record_fields = frozenset(fields or ())
+    outputs: Dict[str, Dict[str, Any]] = {}
+    for _id, result in zip(unique_ids, results):
+        if isinstance(result, BaseException):
+            result = _ngrams_error("get_works_ngrams_batch", _id, result)
+        else:
+            result = _project_ngrams(result, record_fields, max_ngrams)
+        outputs[_id.upper()] = result
+    return _json_text_content({"ngrams": [outputs[_id.upper()] for _id in cleaned_ids]})
 
 # --- Main Execution ---
-def main():
+def main() -> None:
     """Runs the MCP server."""
     logging.warning("Starting OpenAlex MCP Server!")
     mcp.run()